@@ -7,22 +7,27 @@ Version: 1.0
 """
 
 import os
+import re
+import errno
+import select
 import socket
+import struct
 import time
-import random
 import sys
 import threading
 import logging
+import logging.handlers
 import argparse
-import queue
-import statistics
 import platform
+import asyncio
+import ctypes
+import ctypes.util
 import psutil
 import requests
 import colorama
 from typing import Tuple, List, Dict, Optional
+from collections import deque
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
 from rich.table import Table
@@ -31,9 +36,239 @@ from rich.syntax import Syntax
 from rich.layout import Layout
 from rich.live import Live
 
+try:
+    import uvloop  # Optional, enables the uvloop engine
+except ImportError:
+    uvloop = None
+
 # Initialize colorama for cross-platform color support
 colorama.init(autoreset=True)
 
+# Timestamp, sequence and flags, 8 bytes each
+HEADER_STRUCT = struct.Struct('>QQQ')
+HEADER_SIZE = HEADER_STRUCT.size
+# Packets handed to the kernel per sendmmsg(2) call
+SENDMMSG_BATCH = 32
+# Random bytes generated once and sliced into packet payloads. Payloads are
+# therefore only quasi-random, which is fine for throughput testing.
+RAND_POOL_SIZE = 16 * 1024 * 1024
+# Pre-generated header flag words, indexed by sequence number (power of two)
+FLAGS_POOL_SIZE = 4096
+# Large packets are sent with MSG_ZEROCOPY where the kernel supports it for UDP
+ZEROCOPY_MIN_PACKET = 8192
+SO_ZEROCOPY = getattr(socket, 'SO_ZEROCOPY', 60)
+MSG_ZEROCOPY = getattr(socket, 'MSG_ZEROCOPY', 0x4000000)
+SO_EE_ORIGIN_ZEROCOPY = 5
+SO_EE_CODE_ZEROCOPY_COPIED = 1
+# Header slots each zero-copy sender rotates through (a multiple of SENDMMSG_BATCH)
+ZEROCOPY_HEADER_SLOTS = 256
+# Senders back off once this many consecutive CPU samples exceed the threshold,
+# and resume once as many consecutive samples are below it
+CPU_THROTTLE_PERCENT = 90
+CPU_THROTTLE_SAMPLES = 3
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t)
+    ]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int)
+    ]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint)
+    ]
+
+def _load_sendmmsg():
+    """Look up libc sendmmsg(2), available on Linux only
+    
+    Loaded through CDLL rather than PyDLL so the GIL is released for the
+    duration of each call and sender threads can sit in the kernel in parallel.
+    """
+    if platform.system() != 'Linux':
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        sendmmsg = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
+_sendmmsg = _load_sendmmsg()
+
+def _kernel_supports_udp_zerocopy() -> bool:
+    """Check for Linux 5.0 or newer, the first kernel with MSG_ZEROCOPY for UDP"""
+    if platform.system() != 'Linux':
+        return False
+    match = re.match(r'(\d+)\.(\d+)', platform.release())
+    return bool(match) and tuple(map(int, match.groups())) >= (5, 0)
+
+async def _wait_writable(loop: asyncio.AbstractEventLoop, sock: socket.socket) -> None:
+    """Wait until a non-blocking socket has send buffer room
+    
+    Stands in for loop.sock_sendto, which uvloop does not implement.
+    """
+    waiter = loop.create_future()
+    loop.add_writer(sock, lambda: waiter.done() or waiter.set_result(None))
+    try:
+        await waiter
+    finally:
+        loop.remove_writer(sock)
+
+# Send engines: per-packet sender threads, batched sendmmsg(2) sender threads
+# (Linux) or one task per socket on a uvloop event loop
+ENGINES = ('threads', 'sendmmsg', 'uvloop')
+DEFAULT_ENGINE = 'sendmmsg' if _sendmmsg is not None else 'threads'
+
+class MMsgBatch:
+    """Pre-built sendmmsg(2) message array gathering a header and a shared payload
+    
+    Message i is sent as two iovecs: header slot i of the headers buffer, so
+    headers can be rewritten in place between calls, followed by the payload
+    common to every message.
+    """
+    
+    def __init__(self, headers: memoryview, payload: memoryview, target: Tuple[str, int]):
+        self.count = len(headers) // HEADER_SIZE
+        self._headers = (ctypes.c_char * len(headers)).from_buffer(headers)
+        self._payload = (ctypes.c_char * len(payload)).from_buffer(payload)
+        
+        ip, port = target
+        sockaddr = (struct.pack('=H', socket.AF_INET) + struct.pack('>H', port)
+                    + socket.inet_aton(ip) + bytes(8))
+        self._sockaddr = ctypes.create_string_buffer(sockaddr, len(sockaddr))
+        
+        base = ctypes.addressof(self._headers)
+        self._iovecs = (_IOVec * (2 * self.count))()
+        self.msgs = (_MMsgHdr * self.count)()
+        for i in range(self.count):
+            header_iov, payload_iov = self._iovecs[2 * i], self._iovecs[2 * i + 1]
+            header_iov.iov_base = base + i * HEADER_SIZE
+            header_iov.iov_len = HEADER_SIZE
+            payload_iov.iov_base = ctypes.addressof(self._payload)
+            payload_iov.iov_len = len(payload)
+            hdr = self.msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self._sockaddr)
+            hdr.msg_namelen = len(sockaddr)
+            hdr.msg_iov = ctypes.pointer(header_iov)
+            hdr.msg_iovlen = 2
+
+class ZeroCopyTracker:
+    """Track which header slots the kernel may still read under MSG_ZEROCOPY
+    
+    A zero-copy send returns before the kernel has read the user buffer, so
+    a header slot must not be rewritten until the completion notice for the
+    send that last used it has been read from the socket error queue. The
+    kernel numbers each socket's zero-copy sends from 0 and reports them
+    done as inclusive ranges, merging consecutive sends into one notice.
+    """
+    
+    def __init__(self, sock: socket.socket, slots: int):
+        self.sock = sock
+        self.pending = [None] * slots  # Number of the send last using each slot
+        self.next_id = 0
+        self.copied = False
+        self._poller = select.poll()
+        self._poller.register(sock, select.POLLERR)
+    
+    def sent(self, slot: int) -> None:
+        """Record a successful zero-copy send from `slot`"""
+        self.pending[slot] = self.next_id
+        self.next_id = (self.next_id + 1) & 0xFFFFFFFF
+    
+    def drain(self) -> None:
+        """Read queued completion notices and free the slots they cover
+        
+        Unread notices are charged to the socket's option memory; once that
+        fills up, zero-copy sends fail with ENOBUFS. Sets `copied` if the
+        kernel reports it copied the data anyway (loopback, local addresses,
+        devices without scatter-gather), where zero-copy only adds cost.
+        """
+        pending = self.pending
+        while self._poller.poll(0):
+            try:
+                _, ancdata, _, _ = self.sock.recvmsg(0, 1024, socket.MSG_ERRQUEUE)
+            except OSError:
+                break
+            for _, _, data in ancdata:
+                # struct sock_extended_err: ee_errno, ee_origin, ee_type, ee_code,
+                # ee_pad, ee_info (first send), ee_data (last send)
+                if len(data) < 16:
+                    continue
+                _, origin, _, code, _, first, last = struct.unpack_from('=IBBBBII', data)
+                if origin != SO_EE_ORIGIN_ZEROCOPY:
+                    continue
+                if code & SO_EE_CODE_ZEROCOPY_COPIED:
+                    self.copied = True
+                span = (last - first) & 0xFFFFFFFF
+                for slot, send_id in enumerate(pending):
+                    if send_id is not None and (send_id - first) & 0xFFFFFFFF <= span:
+                        pending[slot] = None
+    
+    def wait_notices(self, timeout: float) -> None:
+        """Block until completion notices are queued, then read them"""
+        if not self._poller.poll(int(timeout * 1000)):
+            raise TimeoutError("Timed out waiting for zero-copy completions")
+        self.drain()
+    
+    def wait(self, slots: range, timeout: float) -> None:
+        """Block until the kernel is done with every slot in `slots`"""
+        pending = self.pending
+        while any(pending[slot] is not None for slot in slots):
+            self.wait_notices(timeout)
+
+class SendPacer:
+    """Per-sender token bucket spacing sends evenly at a fixed interval
+    
+    Up to `burst` sends of credit may build up, so sleep overshoots are made
+    up on the following sends without bursting after a long stall.
+    """
+    
+    def __init__(self, interval: float, burst: int = SENDMMSG_BATCH):
+        self.interval = interval
+        self.max_credit = interval * burst
+        self.next_send = time.perf_counter()
+    
+    def reserve(self, packets: int = 1) -> float:
+        """Reserve the next `packets` sends, returning seconds to wait first"""
+        now = time.perf_counter()
+        start = max(self.next_send, now - self.max_credit)
+        self.next_send = start + self.interval * packets
+        return start - now
+    
+    def refund(self, packets: int) -> None:
+        """Return reserved sends that did not go out, so retries aren't charged twice"""
+        self.next_send -= self.interval * packets
+
+class _FanOutHandler(logging.Handler):
+    """Hand each record to several handlers, honouring their levels
+    
+    MemoryHandler flushes to a single target handler; this lets it flush to
+    every handler the root logger writes to.
+    """
+    
+    def __init__(self, handlers: List[logging.Handler]):
+        super().__init__()
+        self.handlers = handlers
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
 @dataclass
 class SystemResources:
     """System Resource Monitor"""
@@ -41,23 +276,45 @@ class SystemResources:
     memory_percent: float = 0.0
     network_speed: float = 0.0
     active_connections: int = 0
+    overloaded: bool = False
 
 @dataclass
 class NetworkStats:
-    """Network Statistics Tracker"""
-    packets_sent: int = 0
-    bytes_sent: int = 0
-    failed_attempts: int = 0
+    """Network Statistics Tracker
+    
+    Counters are kept per sender thread and indexed by socket id, so each
+    thread only ever writes its own slot and no lock is needed. Sampled
+    response times (in nanoseconds) are kept as a running sum and count.
+    """
+    thread_count: int = 1
     successful_attempts: int = 0
     start_time: float = 0.0
-    response_times: List[float] = None
-    packet_sizes: List[int] = None
+    sent_per_thread: List[int] = None
+    bytes_per_thread: List[int] = None
+    failed_per_thread: List[int] = None
+    rt_sum_per_thread: List[int] = None
+    rt_count_per_thread: List[int] = None
 
     def __post_init__(self):
-        self.response_times = []
-        self.packet_sizes = []
+        self.sent_per_thread = [0] * self.thread_count
+        self.bytes_per_thread = [0] * self.thread_count
+        self.failed_per_thread = [0] * self.thread_count
+        self.rt_sum_per_thread = [0] * self.thread_count
+        self.rt_count_per_thread = [0] * self.thread_count
         self.start_time = time.time()
 
+    @property
+    def packets_sent(self) -> int:
+        return sum(self.sent_per_thread)
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(self.bytes_per_thread)
+
+    @property
+    def failed_attempts(self) -> int:
+        return sum(self.failed_per_thread)
+
     @property
     def success_rate(self) -> float:
         total = self.packets_sent + self.failed_attempts
@@ -65,8 +322,9 @@ class NetworkStats:
 
     @property
     def average_response(self) -> float:
-        """Calculate average response time"""
-        return statistics.mean(self.response_times) if self.response_times else 0.0
+        """Calculate average response time in seconds"""
+        rt_count = sum(self.rt_count_per_thread)
+        return sum(self.rt_sum_per_thread) / rt_count / 1e9 if rt_count else 0.0
 
 class DragonUI:
     """Enhanced User Interface Manager"""
@@ -106,24 +364,51 @@ class DragonNetworkTester:
                  duration: int,
                  thread_count: int = 10,
                  packet_size: int = 1024,
-                 buffer_size: int = 65507,
-                 verbose: bool = False):
+                 buffer_size: int = 4 * 1024 * 1024,
+                 verbose: bool = False,
+                 engine: str = DEFAULT_ENGINE,
+                 show_ui: bool = True,
+                 pps: Optional[int] = None):
         
         self.validate_input(target_ip, target_port, duration)
+        if pps is not None and pps <= 0:
+            raise ValueError("Packet rate must be positive")
+        if engine not in ENGINES:
+            raise ValueError(f"Engine must be one of: {', '.join(ENGINES)}")
+        if engine == 'sendmmsg' and _sendmmsg is None:
+            raise ValueError("The sendmmsg engine requires Linux")
+        if engine == 'uvloop' and uvloop is None:
+            raise ValueError("The uvloop engine requires the uvloop package")
         
         self.target = (target_ip, target_port)
         self.duration = duration
         self.thread_count = min(thread_count, 500)  # Safety limit
-        self.packet_size = min(packet_size, 65507)  # Max UDP packet size
+        self.packet_size = max(HEADER_SIZE, min(packet_size, 65507))  # Header size to max UDP packet size
         self.buffer_size = buffer_size
         self.verbose = verbose
+        self.engine = engine
+        self.show_ui = show_ui
+        self.pps = pps
         
-        self.stats = NetworkStats()
+        self.stats = NetworkStats(thread_count=self.thread_count)
         self.system_resources = SystemResources()
-        self.packet_queue = queue.Queue(maxsize=100000)
+        self._cpu_samples = deque(maxlen=CPU_THROTTLE_SAMPLES)
+        psutil.cpu_percent(interval=None)  # Prime the non-blocking CPU counter
         self.console = Console()
         self.stop_event = threading.Event()
         
+        # Each sender gets a payload view into the shared random pool. The view is
+        # writable, as ctypes needs for MMsgBatch, but senders never write it
+        payload_len = self.packet_size - HEADER_SIZE
+        self._rand_pool = bytearray(os.urandom(
+            max(payload_len, min(RAND_POOL_SIZE, payload_len * self.thread_count))))
+        pool = memoryview(self._rand_pool)
+        self._flags_pool = list(struct.unpack(f'>{FLAGS_POOL_SIZE}Q', os.urandom(8 * FLAGS_POOL_SIZE)))
+        self._payloads = []
+        for i in range(self.thread_count):
+            offset = (i * payload_len) % (len(pool) - payload_len + 1)
+            self._payloads.append(pool[offset:offset + payload_len])
+        
         # Enhanced socket configurations
         self.socket_configs = {
             'timeout': 2.0,
@@ -156,23 +441,69 @@ class DragonNetworkTester:
                 logging.StreamHandler(sys.stdout)
             ]
         )
+        
+        # Sender errors are buffered and written out in batches of up to 1000
+        # records, so a burst of failures doesn't become a burst of file and
+        # terminal writes. A full buffer is still flushed mid-run; whatever is
+        # left is flushed in _cleanup.
+        self._sender_log_buffer = logging.handlers.MemoryHandler(
+            capacity=1000,
+            flushLevel=logging.CRITICAL,
+            target=_FanOutHandler(logging.getLogger().handlers)
+        )
+        self._sender_log = logging.getLogger("dragon")
+        self._sender_log.handlers = [self._sender_log_buffer]
+        self._sender_log.propagate = False
 
     def _setup_sockets(self) -> None:
         """Initialize and configure optimized network sockets"""
         self.sockets = []
+        actual_sndbuf = None
+        # Resolve once so sends never look the name up. Sockets stay
+        # unconnected: a connected UDP socket reports ICMP port unreachable as
+        # ECONNREFUSED on later sends, which would fail sends to closed ports
+        self._resolved_target = (socket.gethostbyname(self.target[0]), self.target[1])
+        # Let the kernel send large packets straight from our buffers. The
+        # uvloop engine cannot pass send flags, so it always copies
+        zerocopy = (self.engine != 'uvloop'
+                    and self.packet_size >= ZEROCOPY_MIN_PACKET
+                    and _kernel_supports_udp_zerocopy())
         for _ in range(self.thread_count):
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(self.socket_configs['timeout'])
+            if self.engine == 'uvloop':
+                sock.setblocking(False)  # Required by the event loop socket API
+            else:
+                sock.settimeout(self.socket_configs['timeout'])
             
             # Enhanced socket options
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.buffer_size)
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.buffer_size)
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if actual_sndbuf is None:
+                actual_sndbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
             
             if hasattr(socket, 'SO_REUSEPORT'):  # Linux specific
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            
+            if zerocopy:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, SO_ZEROCOPY, 1)
+                except OSError as e:
+                    logging.debug(f"SO_ZEROCOPY unavailable: {str(e)}")
+                    zerocopy = False
                 
             self.sockets.append(sock)
+        self._send_flags = MSG_ZEROCOPY if zerocopy else 0
+        
+        # The kernel silently caps buffer sizes (net.core.wmem_max on Linux).
+        # Linux also reports double the usable size to cover its bookkeeping
+        if actual_sndbuf is not None and platform.system() == 'Linux':
+            actual_sndbuf //= 2
+        if actual_sndbuf is not None and actual_sndbuf < self.buffer_size:
+            hint = (f" (raise it with: sysctl -w net.core.wmem_max={self.buffer_size})"
+                    if platform.system() == 'Linux' else "")
+            logging.warning(f"Send buffer capped at {actual_sndbuf} bytes, "
+                            f"requested {self.buffer_size}{hint}")
 
     def _check_target_availability(self) -> None:
         """Verify target accessibility"""
@@ -184,82 +515,318 @@ class DragonNetworkTester:
         except Exception as e:
             logging.warning(f"Target may be unreachable: {str(e)}")
 
-    def _monitor_system_resources(self) -> None:
-        """Monitor system resource usage"""
-        while not self.stop_event.is_set():
-            self.system_resources.cpu_percent = psutil.cpu_percent()
+    def _update_system_resources(self, second: int) -> None:
+        """Sample system resource usage, called once per second of the test
+        
+        CPU is sampled every second; memory every 5 seconds and the connection
+        count, which walks /proc/net on Linux, only every 10 seconds.
+        """
+        self.system_resources.cpu_percent = psutil.cpu_percent(interval=None)
+        self._cpu_samples.append(self.system_resources.cpu_percent)
+        if len(self._cpu_samples) == CPU_THROTTLE_SAMPLES:
+            if min(self._cpu_samples) > CPU_THROTTLE_PERCENT:
+                self.system_resources.overloaded = True
+            elif max(self._cpu_samples) < CPU_THROTTLE_PERCENT:
+                self.system_resources.overloaded = False
+        if second % 5 == 0:
             self.system_resources.memory_percent = psutil.virtual_memory().percent
+        if second % 10 == 0:
             self.system_resources.active_connections = len(psutil.net_connections())
-            time.sleep(1)
 
-    def _generate_packet(self) -> bytes:
-        """Generate sophisticated test packet with headers"""
-        header = bytearray([
-            random.randint(0, 255) for _ in range(24)
-        ])
-        payload = random._urandom(self.packet_size - 24)
-        return bytes(header) + payload
+    def _create_pacer(self) -> Optional[SendPacer]:
+        """Create a pacer giving each sender an equal share of the target rate"""
+        if self.pps is None:
+            return None
+        return SendPacer(self.thread_count / self.pps)
+
+    def _background_loop(self) -> None:
+        """Run all periodic bookkeeping on a single thread until the test stops"""
+        second = 0
+        while not self.stop_event.is_set():
+            self._update_system_resources(second)
+            second += 1
+            self.stop_event.wait(1)
+
+    def _loop_invariants(self) -> tuple:
+        """Bind what every send loop uses, for the loops to unpack into locals"""
+        stats = self.stats
+        return (HEADER_STRUCT.pack_into, time.time, time.perf_counter_ns,
+                self.stop_event.is_set, self.system_resources, self.packet_size,
+                stats.sent_per_thread, stats.bytes_per_thread,
+                stats.rt_sum_per_thread, stats.rt_count_per_thread,
+                self._flags_pool, FLAGS_POOL_SIZE - 1, self._create_pacer())
+
+    def _record_send_error(self, socket_id: int, error: Exception) -> None:
+        """Count a failed send, logging it in verbose mode"""
+        self.stats.failed_per_thread[socket_id] += 1
+        if self.verbose:
+            self._sender_log.error(f"Sender {socket_id} error: {str(error)}")
 
     def _send_packets(self, socket_id: int) -> None:
         """Enhanced packet sending with advanced error handling and rate limiting"""
+        if self.engine == 'sendmmsg':
+            return self._send_packet_batches(socket_id)
+        
         sock = self.sockets[socket_id]
+        target = self._resolved_target
+        # A contiguous copy sent with sendto() beat sendmsg() gathering header
+        # and payload for almost every packet size, so only sendmmsg batches and
+        # zero-copy sends gather
+        packet = bytearray(HEADER_SIZE) + self._payloads[socket_id]
+        # Each send packs its header into `header` at `offset`, then calls send(*args)
+        send, args, header, offset = sock.sendto, (packet, target), packet, 0
         
-        while not self.stop_event.is_set():
+        tracker = None
+        if self._send_flags:
+            # Zero-copy sends rotate through header slots the kernel is done with
+            tracker = ZeroCopyTracker(sock, ZEROCOPY_HEADER_SLOTS)
+            pending, slot_mask = tracker.pending, ZEROCOPY_HEADER_SLOTS - 1
+            header = bytearray(HEADER_SIZE * ZEROCOPY_HEADER_SLOTS)
+            view, payload = memoryview(header), self._payloads[socket_id]
+            send, slot_args = sock.sendmsg, [
+                ([view[start:start + HEADER_SIZE], payload], (), MSG_ZEROCOPY, target)
+                for start in range(0, len(header), HEADER_SIZE)
+            ]
+        
+        # Hoist loop invariants into locals
+        (pack, wall_time, clock, stopped, resources, packet_size, sent, sent_bytes,
+         rt_sum, rt_count, flags, flags_mask, pacer) = self._loop_invariants()
+        timeout = sock.gettimeout()
+        seq = 0
+        
+        while not stopped():
+            try:
+                if pacer is not None:
+                    delay = pacer.reserve()
+                    if delay > 0:
+                        time.sleep(delay)
+                
+                if tracker is not None:
+                    slot = seq & slot_mask
+                    if pending[slot] is not None:
+                        tracker.wait(range(slot, slot + 1), timeout)
+                    args, offset = slot_args[slot], slot * HEADER_SIZE
+                
+                # Header: timestamp, sequence, flags
+                pack(header, offset, int(wall_time()), seq, flags[seq & flags_mask])
+                # Only every 1024th send is timed, keeping clock reads off most sends
+                if seq & 1023:
+                    send(*args)
+                else:
+                    t0 = clock()
+                    send(*args)
+                    rt_sum[socket_id] += clock() - t0
+                    rt_count[socket_id] += 1
+                
+                if tracker is not None:
+                    tracker.sent(slot)
+                    if tracker.copied:
+                        # Zero-copy only adds cost here, go back to copying sends
+                        tracker = None
+                        send, args, header, offset = sock.sendto, (packet, target), packet, 0
+                seq += 1
+                sent[socket_id] = seq
+                sent_bytes[socket_id] = seq * packet_size
+                
+                # Back off while the host stays saturated
+                if resources.overloaded:
+                    time.sleep(0.01)
+                    
+            except OSError as e:
+                if e.errno == errno.ENOBUFS and tracker is not None:
+                    # Option memory is taken up by in-flight completion notices
+                    tracker.wait_notices(timeout)
+                    if pacer is not None:
+                        pacer.refund(1)
+                    continue
+                self._record_send_error(socket_id, e)
+                time.sleep(0.1)
+            except Exception as e:
+                self._record_send_error(socket_id, e)
+                time.sleep(0.1)
+
+    def _send_packet_batches(self, socket_id: int) -> None:
+        """Linux fast path handing a whole batch of packets to one sendmmsg(2) call"""
+        sock = self.sockets[socket_id]
+        send_flags = self._send_flags
+        # Zero-copy batches rotate through header slots the kernel is done with
+        tracker = ZeroCopyTracker(sock, ZEROCOPY_HEADER_SLOTS) if send_flags else None
+        headers = bytearray(HEADER_SIZE * (ZEROCOPY_HEADER_SLOTS if send_flags else SENDMMSG_BATCH))
+        view, batch_len = memoryview(headers), HEADER_SIZE * SENDMMSG_BATCH
+        batches = [MMsgBatch(view[offset:offset + batch_len], self._payloads[socket_id],
+                             self._resolved_target)
+                   for offset in range(0, len(headers), batch_len)]
+        count = SENDMMSG_BATCH
+        offsets = range(0, batch_len, HEADER_SIZE)
+        batch_index = 0
+        
+        # Hoist loop invariants into locals
+        (pack, wall_time, clock, stopped, resources, packet_size, sent, sent_bytes,
+         rt_sum, rt_count, flags, flags_mask, pacer) = self._loop_invariants()
+        sendmmsg, fd, timeout = _sendmmsg, sock.fileno(), sock.gettimeout()
+        seq = 0
+        
+        while not stopped():
             try:
-                packet = self._generate_packet()
-                start_time = time.time()
+                if pacer is not None:
+                    delay = pacer.reserve(count)
+                    if delay > 0:
+                        time.sleep(delay)
+                
+                first_slot = batch_index * count
+                if tracker is not None:
+                    tracker.wait(range(first_slot, first_slot + count), timeout)
+                base = first_slot * HEADER_SIZE
+                now = int(wall_time())
+                for offset, packet_seq in zip(offsets, range(seq, seq + count)):
+                    pack(headers, base + offset, now, packet_seq, flags[packet_seq & flags_mask])
+                
+                # Time roughly every 1024th packet, recorded per packet
+                sample = (seq & 1023) < count
+                if sample:
+                    t0 = clock()
                 
-                sock.sendto(packet, self.target)
+                n = sendmmsg(fd, batches[batch_index].msgs, count, send_flags)
+                if pacer is not None and n < count:
+                    # Only charge the pacer for the packets that went out
+                    pacer.refund(count - max(n, 0))
+                if n < 0:
+                    err = ctypes.get_errno()
+                    if err == errno.EAGAIN:
+                        # Socket buffer full, wait for room like sendto would
+                        select.select([], [sock], [], timeout)
+                        continue
+                    if err == errno.ENOBUFS and tracker is not None:
+                        # Option memory is taken up by in-flight completion notices
+                        tracker.wait_notices(timeout)
+                        continue
+                    raise OSError(err, os.strerror(err))
                 
-                response_time = time.time() - start_time
-                with threading.Lock():
-                    self.stats.packets_sent += 1
-                    self.stats.bytes_sent += len(packet)
-                    self.stats.response_times.append(response_time)
-                    self.stats.packet_sizes.append(len(packet))
+                if sample and n:
+                    rt_sum[socket_id] += (clock() - t0) // n
+                    rt_count[socket_id] += 1
+                if tracker is not None:
+                    if send_flags:
+                        for slot in range(first_slot, first_slot + n):
+                            tracker.sent(slot)
+                    if tracker.copied:
+                        # Zero-copy only adds cost here, go back to copying sends
+                        send_flags = 0
+                    batch_index = (batch_index + 1) % len(batches)
+                seq += n
+                sent[socket_id] = seq
+                sent_bytes[socket_id] = seq * packet_size
                 
-                # Adaptive rate limiting based on system load
-                if self.system_resources.cpu_percent > 90:
+                # Back off while the host stays saturated
+                if resources.overloaded:
                     time.sleep(0.01)
-                elif self.stats.packets_sent % 1000 == 0:
-                    time.sleep(0.001)
                     
             except Exception as e:
-                with threading.Lock():
-                    self.stats.failed_attempts += 1
-                if self.verbose:
-                    logging.error(f"Thread {socket_id} error: {str(e)}")
+                self._record_send_error(socket_id, e)
                 time.sleep(0.1)
 
+    async def _send_packets_async(self, socket_id: int) -> None:
+        """Event loop engine sending on one non-blocking socket
+        
+        Each task keeps at most one datagram in flight on its socket, so the
+        loop's pending writes stay bounded at one per socket.
+        """
+        loop = asyncio.get_running_loop()
+        sock = self.sockets[socket_id]
+        packet = bytearray(HEADER_SIZE) + self._payloads[socket_id]
+        
+        # Hoist loop invariants into locals
+        (pack, wall_time, clock, stopped, resources, packet_size, sent, sent_bytes,
+         rt_sum, rt_count, flags, flags_mask, pacer) = self._loop_invariants()
+        sendto, target = sock.sendto, self._resolved_target
+        seq = 0
+        
+        while not stopped():
+            try:
+                if pacer is not None:
+                    delay = pacer.reserve()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                
+                # Header: timestamp, sequence, flags
+                pack(packet, 0, int(wall_time()), seq, flags[seq & flags_mask])
+                # Only every 1024th send is timed, keeping clock reads off most
+                # sends. Sends only suspend when the socket buffer is full
+                try:
+                    if seq & 1023:
+                        sendto(packet, target)
+                    else:
+                        t0 = clock()
+                        sendto(packet, target)
+                        rt_sum[socket_id] += clock() - t0
+                        rt_count[socket_id] += 1
+                except BlockingIOError:
+                    await _wait_writable(loop, sock)
+                    if pacer is not None:
+                        pacer.refund(1)
+                    continue
+                seq += 1
+                sent[socket_id] = seq
+                sent_bytes[socket_id] = seq * packet_size
+                
+                # Back off while the host stays saturated, otherwise yield
+                # regularly so other sockets and the stop timer get to run
+                if resources.overloaded:
+                    await asyncio.sleep(0.01)
+                elif (seq & 63) == 0:
+                    await asyncio.sleep(0)
+                    
+            except Exception as e:
+                self._record_send_error(socket_id, e)
+                await asyncio.sleep(0.1)
+
+    async def _run_async_senders(self) -> None:
+        """Run one sender task per socket for the test duration"""
+        tasks = [
+            asyncio.ensure_future(self._send_packets_async(i))
+            for i in range(self.thread_count)
+        ]
+        await asyncio.sleep(self.duration)
+        self.stop_event.set()
+        await asyncio.gather(*tasks)
+
     def start(self) -> None:
         """Execute network test with comprehensive monitoring"""
-        self.console.clear()
-        self._display_banner()
+        if self.show_ui:
+            self.console.clear()
+            self._display_banner()
         
-        # Start system monitoring
-        monitor_thread = threading.Thread(target=self._monitor_system_resources)
-        monitor_thread.start()
+        # Monitoring and display share one background thread
+        background_thread = threading.Thread(target=self._background_loop)
+        background_thread.start()
         
-        with ThreadPoolExecutor(max_workers=self.thread_count) as executor:
-            futures = [
-                executor.submit(self._send_packets, i)
+        if self.engine == 'uvloop':
+            # Sender tasks run on an event loop on this thread
+            loop = uvloop.new_event_loop()
+            try:
+                loop.run_until_complete(self._run_async_senders())
+            finally:
+                loop.close()
+        else:
+            # One long-lived sender thread per socket
+            workers = [
+                threading.Thread(target=self._send_packets, args=(i,),
+                                 name=f"Sender-{i}", daemon=True)
                 for i in range(self.thread_count)
             ]
-            
-            # Start progress display
-            progress_thread = threading.Thread(target=self._display_progress)
-            progress_thread.start()
+            for worker in workers:
+                worker.start()
             
             # Wait for duration
             time.sleep(self.duration)
             self.stop_event.set()
             
-            # Cleanup
-            for future in futures:
-                future.result()
-            progress_thread.join()
-            monitor_thread.join()
-            
+            for worker in workers:
+                worker.join()
+        
+        # Cleanup
+        background_thread.join()
+        
         self._display_final_report()
         self._cleanup()
 
@@ -281,7 +848,7 @@ class DragonNetworkTester:
             ("Total Data", f"{mb_sent:.2f} MB"),
             ("Packet Rate", f"{packets_per_second:.2f} packets/sec"),
             ("Failed Attempts", f"{self.stats.failed_attempts}"),
-            ("Success Rate", f"{(1 - self.stats.failed_attempts/self.stats.packets_sent)*100:.2f}%"),
+            ("Success Rate", f"{self.stats.success_rate:.2f}%"),
             ("Avg Response", f"{self.stats.average_response*1000:.2f} ms")
         ]
         
@@ -297,6 +864,7 @@ class DragonNetworkTester:
                 sock.close()
             except:
                 pass
+        self._sender_log_buffer.flush()
         logging.info("Network test completed and resources cleaned up")
 
     def parse_arguments() -> argparse.Namespace:
@@ -327,33 +895,41 @@ class EnhancedNetworkTester(DragonNetworkTester):
         self.ui = DragonUI(self.console)
         self.test_start_time = None
     
-    def _display_progress(self) -> None:
-        """Display real-time progress with enhanced visuals"""
-        with Progress(
+    def _background_loop(self) -> None:
+        """Sample resources and refresh progress and live statistics on one thread
+        
+        Everything runs on a shared 250 ms tick with rendering driven manually,
+        so neither Live nor Progress start refresh threads of their own.
+        Without the UI only resource sampling runs.
+        """
+        if not self.show_ui:
+            return super()._background_loop()
+        
+        progress = Progress(
             SpinnerColumn(),
             *Progress.get_default_columns(),
             TimeElapsedColumn(),
-            console=self.console
-        ) as progress:
-            task = progress.add_task("[cyan]Running network test...", total=self.duration)
-            while not progress.finished and not self.stop_event.is_set():
-                progress.update(task, completed=time.time() - self.stats.start_time)
-                time.sleep(0.1)
-    
-    def _generate_enhanced_packet(self) -> bytes:
-        """Generate packet with advanced headers and patterns"""
-        timestamp = int(time.time()).to_bytes(8, 'big')
-        sequence = self.stats.packets_sent.to_bytes(8, 'big')
-        flags = random.randint(0, 255).to_bytes(8, 'big')
-        payload = random._urandom(self.packet_size - 24)
-        return timestamp + sequence + flags + payload
-    
-    def _display_live_stats(self):
-        """Display real-time statistics with enhanced visuals"""
-        with Live(self.ui.layout, refresh_per_second=4) as live:
+            console=self.console,
+            auto_refresh=False
+        )
+        task = progress.add_task("[cyan]Running network test...", total=self.duration)
+        self.ui.layout["header"].update(Panel(
+            f"[bold cyan]DragonNetworkTester[/bold cyan] - target {self.target[0]}:{self.target[1]}",
+            border_style="blue"
+        ))
+        self.ui.layout["footer"].update(Panel(progress, border_style="blue"))
+        
+        tick = 0
+        with Live(self.ui.layout, console=self.console, auto_refresh=False) as live:
             while not self.stop_event.is_set():
+                if tick % 4 == 0:
+                    self._update_system_resources(tick // 4)
+                    self._update_monitor_display()
+                progress.update(task, completed=time.time() - self.stats.start_time)
                 self._update_stats_display()
-                time.sleep(0.25)
+                live.refresh()
+                tick += 1
+                self.stop_event.wait(0.25)
     
     def _update_stats_display(self):
         """Update UI with current statistics"""
@@ -369,9 +945,7 @@ class EnhancedNetworkTester(DragonNetworkTester):
             ("Time Elapsed", f"{current_time:.1f}s"),
             ("Packets Sent", f"{self.stats.packets_sent:,}"),
             ("Packet Rate", f"{packets_per_second:.1f}/s"),
-            ("Success Rate", f"{self.stats.success_rate:.1f}%"),
-            ("CPU Usage", f"{self.system_resources.cpu_percent:.1f}%"),
-            ("Memory Usage", f"{self.system_resources.memory_percent:.1f}%")
+            ("Success Rate", f"{self.stats.success_rate:.1f}%")
         ]
         
         for metric, value in stats:
@@ -380,6 +954,26 @@ class EnhancedNetworkTester(DragonNetworkTester):
         self.ui.layout["stats"].update(
             Panel(stats_table, title="Live Statistics", border_style="blue")
         )
+    
+    def _update_monitor_display(self):
+        """Update UI with current system resource usage"""
+        monitor_table = Table(show_header=True, header_style="bold magenta", border_style="blue")
+        monitor_table.add_column("Resource", style="cyan")
+        monitor_table.add_column("Value", style="green")
+        
+        resources = [
+            ("CPU Usage", f"{self.system_resources.cpu_percent:.1f}%"),
+            ("Memory Usage", f"{self.system_resources.memory_percent:.1f}%"),
+            ("Connections", f"{self.system_resources.active_connections:,}"),
+            ("Sender Threads", f"{self.thread_count}")
+        ]
+        
+        for resource, value in resources:
+            monitor_table.add_row(resource, value)
+        
+        self.ui.layout["monitor"].update(
+            Panel(monitor_table, title="System Monitor", border_style="blue")
+        )
 
 def parse_arguments() -> argparse.Namespace:
     """Enhanced command line argument parser"""
@@ -392,6 +986,14 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument("--duration", type=int, required=True, help="Test duration in seconds")
     parser.add_argument("--threads", type=int, default=10, help="Number of threads")
     parser.add_argument("--packet-size", type=int, default=1024, help="Packet size in bytes")
+    parser.add_argument("--engine", choices=ENGINES, default=DEFAULT_ENGINE,
+                        help=f"Send engine (default: {DEFAULT_ENGINE})")
+    parser.add_argument("--pps", type=int, default=None,
+                        help="Target total packet rate (default: unlimited)")
+    parser.add_argument("--ui", dest="ui", action="store_true", default=True,
+                        help="Show live statistics and progress (default)")
+    parser.add_argument("--no-ui", dest="ui", action="store_false",
+                        help="Disable live rendering to leave more CPU to the senders")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
     return parser.parse_args()
 
@@ -400,21 +1002,29 @@ def main():
     console = Console()
     
     try:
-        console.print(DragonUI.BANNER, style="bold blue")
-        console.print("\n[bold cyan]DragonNetworkTester[/bold cyan] - Advanced Network Testing Suite")
-        console.print("Version 1.0 - Enhanced Edition\n")
-        
         args = parse_arguments()
         
-        with console.status("[bold green]Initializing test suite..."):
-            tester = EnhancedNetworkTester(
-                target_ip=args.ip,
-                target_port=args.port,
-                duration=args.duration,
-                thread_count=args.threads,
-                packet_size=args.packet_size,
-                verbose=args.verbose
-            )
+        if args.ui:
+            console.print(DragonUI.BANNER, style="bold blue")
+            console.print("\n[bold cyan]DragonNetworkTester[/bold cyan] - Advanced Network Testing Suite")
+            console.print("Version 1.0 - Enhanced Edition\n")
+        
+        tester_args = dict(
+            target_ip=args.ip,
+            target_port=args.port,
+            duration=args.duration,
+            thread_count=args.threads,
+            packet_size=args.packet_size,
+            verbose=args.verbose,
+            engine=args.engine,
+            show_ui=args.ui,
+            pps=args.pps
+        )
+        if args.ui:
+            with console.status("[bold green]Initializing test suite..."):
+                tester = EnhancedNetworkTester(**tester_args)
+        else:
+            tester = EnhancedNetworkTester(**tester_args)
         
         tester.start()
         